@@ -0,0 +1,148 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+C implementation of the iterative adaptive Simpson's rule, used by
+integrator.py when the integrand cannot be compiled with numba.
+Build with: python setup.py build_ext --inplace
+"""
+from cpython.pycapsule cimport PyCapsule_CheckExact, PyCapsule_GetContext, PyCapsule_GetName, PyCapsule_GetPointer
+from libc.math cimport fabs, isfinite
+from libc.stdlib cimport free, malloc, realloc
+
+import numpy as np
+
+cdef enum:
+    MAX_DEPTH = 50
+    # Depth-first traversal keeps at most one pending sibling per level
+    STACK_SIZE = MAX_DEPTH + 2
+    EVAL_SIZE = 4096
+
+# Same signature as a scipy.LowLevelCallable "double (double, void *)"
+ctypedef double (*scalar_fn)(double x, void *data) except? -1
+
+cdef struct Interval:
+    double a, b, fa, fb, fc, whole, tol
+    int depth
+
+cdef struct Points:
+    double *xs
+    double *ys
+    Py_ssize_t n, size
+
+
+cdef double _call_python(double x, void *data) except? -1:
+    return (<object>data)(x)
+
+
+cdef int _record(Points *pts, double x, double fx) except -1:
+    cdef double *xs
+    cdef double *ys
+    if pts.n == pts.size:
+        xs = <double *>realloc(pts.xs, 2 * pts.size * sizeof(double))
+        if xs == NULL:
+            raise MemoryError()
+        pts.xs = xs
+        ys = <double *>realloc(pts.ys, 2 * pts.size * sizeof(double))
+        if ys == NULL:
+            raise MemoryError()
+        pts.ys = ys
+        pts.size *= 2
+    pts.xs[pts.n] = x
+    pts.ys[pts.n] = fx
+    pts.n += 1
+    return 0
+
+
+cdef double _asimpson(scalar_fn f, void *data, double a, double b, double tol,
+                      Points *pts) except? -1:
+    cdef Interval stack[STACK_SIZE]
+    cdef Interval cur
+    cdef Py_ssize_t top = 0
+    cdef double c, d, e, fd, fe, left, right, delta
+    cdef double total = 0.0
+
+    c = 0.5 * (a + b)
+    cur.a = a
+    cur.b = b
+    cur.fa = f(a, data)
+    cur.fb = f(b, data)
+    cur.fc = f(c, data)
+    cur.whole = (b - a) / 6 * (cur.fa + 4 * cur.fc + cur.fb)
+    cur.tol = tol
+    cur.depth = 0
+    _record(pts, a, cur.fa)
+    _record(pts, b, cur.fb)
+    _record(pts, c, cur.fc)
+    stack[0] = cur
+    top = 1
+
+    while top > 0:
+        top -= 1
+        cur = stack[top]
+        c = 0.5 * (cur.a + cur.b)
+        d = 0.5 * (cur.a + c)
+        e = 0.5 * (c + cur.b)
+        fd = f(d, data)
+        fe = f(e, data)
+        _record(pts, d, fd)
+        _record(pts, e, fe)
+
+        left = (c - cur.a) / 6 * (cur.fa + 4 * fd + cur.fc)
+        right = (cur.b - c) / 6 * (cur.fc + 4 * fe + cur.fb)
+        delta = left + right - cur.whole
+        if not isfinite(delta):
+            raise ValueError("integrand is not finite on the integration interval")
+        # Accept the estimate if it is good enough or the maximum depth is reached
+        if fabs(delta) <= 15 * cur.tol or cur.depth >= MAX_DEPTH:
+            total += left + right + delta / 15
+        else:
+            stack[top] = Interval(c, cur.b, cur.fc, cur.fb, fe, right, cur.tol / 2,
+                                  cur.depth + 1)
+            stack[top + 1] = Interval(cur.a, c, cur.fa, cur.fc, fd, left, cur.tol / 2,
+                                      cur.depth + 1)
+            top += 2
+
+    return total
+
+
+def adaptive_simpson_c(f, double a, double b, double tol):
+    """
+    Adaptive Simpson's rule on [a, b] to tolerance tol.
+    f is a Python callable, or a scipy.LowLevelCallable with signature
+    "double (double, void *)", which is called without PyObject round-trips.
+    Returns the integral and the (unsorted) evaluation points and values.
+    """
+    cdef scalar_fn func = _call_python
+    cdef void *data = <void *>f
+    cdef Points pts
+    cdef double result
+    cdef double[::1] xs_view, ys_view
+    cdef Py_ssize_t i
+
+    if getattr(f, 'signature', None) == 'double (double, void *)' and isinstance(f, tuple):
+        # LowLevelCallable is a tuple whose first item is a capsule named by the
+        # signature, with the user data pointer stored as its context
+        capsule = tuple.__getitem__(f, 0)
+        if PyCapsule_CheckExact(capsule):
+            func = <scalar_fn>PyCapsule_GetPointer(capsule, PyCapsule_GetName(capsule))
+            data = PyCapsule_GetContext(capsule)
+
+    pts.n = 0
+    pts.size = EVAL_SIZE
+    pts.xs = <double *>malloc(EVAL_SIZE * sizeof(double))
+    pts.ys = <double *>malloc(EVAL_SIZE * sizeof(double))
+    try:
+        if pts.xs == NULL or pts.ys == NULL:
+            raise MemoryError()
+        result = _asimpson(func, data, a, b, tol, &pts)
+
+        xs = np.empty(pts.n)
+        ys = np.empty(pts.n)
+        xs_view = xs
+        ys_view = ys
+        for i in range(pts.n):
+            xs_view[i] = pts.xs[i]
+            ys_view[i] = pts.ys[i]
+    finally:
+        free(pts.xs)
+        free(pts.ys)
+    return result, xs, ys
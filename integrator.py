@@ -1,5 +1,432 @@
+import ast
+import functools
+import operator
+import re
+from collections.abc import Hashable
+
 import numpy as np
 import sympy
+from numpy.polynomial import Polynomial
+
+try:
+    import numba
+    from numba.core.ccallback import CFunc
+except ImportError:  # numba is optional; pure Python/NumPy paths are used instead
+    numba = None
+
+try:
+    from _adaptive import adaptive_simpson_c
+except ImportError:  # optional C extension, built with: python setup.py build_ext --inplace
+    adaptive_simpson_c = None
+
+
+_leggauss = functools.lru_cache(maxsize=64)(np.polynomial.legendre.leggauss)
+
+
+@functools.lru_cache(maxsize=64)
+def _gauss_nodes(n, a, b):
+    """
+    Gauss-Legendre nodes and weights for n points, mapped from [-1, 1] to [a, b].
+    The arrays are shared between calls, so they are returned read-only.
+    """
+    nodes, weights = _leggauss(n)
+    transformed_nodes = 0.5 * (nodes + 1) * (b - a) + a
+    transformed_weights = 0.5 * weights * (b - a)
+    transformed_nodes.flags.writeable = False
+    transformed_weights.flags.writeable = False
+    return transformed_nodes, transformed_weights
+
+
+def _is_numba_callable(f):
+    """True if f can be called from inside a numba-compiled kernel."""
+    return numba is not None and (numba.extending.is_jitted(f) or isinstance(f, CFunc))
+
+
+def _jit_scalar(func):
+    """
+    Compiles a scalar callable with numba, or returns None if numba is not
+    installed or cannot compile it. Compiling eagerly for float64(float64)
+    makes compile errors surface here rather than deep inside a quadrature
+    routine, and casts integer results of constant expressions to float64
+    as the kernels' callback type requires. NumPy's error model turns a
+    division by zero into inf, which the kernels reject as non-finite.
+    """
+    if numba is None:
+        return None
+    try:
+        func_jit = numba.njit('float64(float64)', error_model='numpy')(func)
+    except Exception:
+        return None
+    return func_jit
+
+
+def _scalar_jit(f):
+    """
+    Numba-compiled scalar version of f for the compiled kernels, or None.
+    Integrands from parse_function carry a make_scalar factory; it is only
+    compiled here, on first use, and the result is cached on f as f.jit.
+    """
+    if _is_numba_callable(f):
+        return f
+    if numba is None or not hasattr(f, 'make_scalar'):
+        return None
+    if not hasattr(f, 'jit'):
+        f.jit = _jit_scalar(f.make_scalar())
+    return f.jit
+
+
+_ADAPTIVE_MAX_DEPTH = 50
+# Depth-first traversal keeps at most one pending sibling per level
+_ADAPTIVE_STACK_SIZE = _ADAPTIVE_MAX_DEPTH + 2
+_ADAPTIVE_EVAL_SIZE = 4096
+
+
+def _adaptive_simpson_core(f, a, b, tol):
+    """
+    Iterative adaptive Simpson's rule on an explicit stack.
+    Each stack row holds (a, b, fa, fb, fc, whole, tol, depth), so every
+    point is evaluated exactly once. Intervals are accepted once they reach
+    _ADAPTIVE_MAX_DEPTH; a non-finite integrand raises ValueError. Returns
+    the integral and the (unsorted) evaluation points and values.
+    """
+    xs = np.empty(_ADAPTIVE_EVAL_SIZE)
+    ys = np.empty(_ADAPTIVE_EVAL_SIZE)
+
+    c = 0.5 * (a + b)
+    fa = f(a)
+    fb = f(b)
+    fc = f(c)
+    xs[0], xs[1], xs[2] = a, b, c
+    ys[0], ys[1], ys[2] = fa, fb, fc
+    n_pts = 3
+
+    stack = np.empty((_ADAPTIVE_STACK_SIZE, 8))
+    stack[0, 0] = a
+    stack[0, 1] = b
+    stack[0, 2] = fa
+    stack[0, 3] = fb
+    stack[0, 4] = fc
+    stack[0, 5] = (b - a) / 6 * (fa + 4 * fc + fb)
+    stack[0, 6] = tol
+    stack[0, 7] = 0
+    top = 1
+
+    total = 0.0
+    while top > 0:
+        top -= 1
+        a = stack[top, 0]
+        b = stack[top, 1]
+        fa = stack[top, 2]
+        fb = stack[top, 3]
+        fc = stack[top, 4]
+        whole = stack[top, 5]
+        tol = stack[top, 6]
+        depth = stack[top, 7]
+
+        c = 0.5 * (a + b)
+        d = 0.5 * (a + c)
+        e = 0.5 * (c + b)
+        fd = f(d)
+        fe = f(e)
+
+        if n_pts + 2 > xs.shape[0]:
+            grown_xs = np.empty(2 * xs.shape[0])
+            grown_ys = np.empty(2 * ys.shape[0])
+            grown_xs[:n_pts] = xs[:n_pts]
+            grown_ys[:n_pts] = ys[:n_pts]
+            xs = grown_xs
+            ys = grown_ys
+        xs[n_pts], xs[n_pts + 1] = d, e
+        ys[n_pts], ys[n_pts + 1] = fd, fe
+        n_pts += 2
+
+        left = (c - a) / 6 * (fa + 4 * fd + fc)
+        right = (b - c) / 6 * (fc + 4 * fe + fb)
+        delta = left + right - whole
+        if not np.isfinite(delta):
+            raise ValueError("integrand is not finite on the integration interval")
+        # Accept the estimate if it is good enough or the maximum depth is reached
+        if abs(delta) <= 15 * tol or depth >= _ADAPTIVE_MAX_DEPTH:
+            total += left + right + delta / 15
+        else:
+            stack[top, 0] = c
+            stack[top, 1] = b
+            stack[top, 2] = fc
+            stack[top, 3] = fb
+            stack[top, 4] = fe
+            stack[top, 5] = right
+            stack[top, 6] = tol / 2
+            stack[top, 7] = depth + 1
+            top += 1
+            stack[top, 0] = a
+            stack[top, 1] = c
+            stack[top, 2] = fa
+            stack[top, 3] = fc
+            stack[top, 4] = fd
+            stack[top, 5] = left
+            stack[top, 6] = tol / 2
+            stack[top, 7] = depth + 1
+            top += 1
+
+    return total, xs[:n_pts], ys[:n_pts]
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_adaptive_simpson_core():
+    """
+    _adaptive_simpson_core compiled on first use against a fixed
+    float64(float64) callback type, so new integrands reuse the same machine
+    code instead of triggering a recompile of the whole kernel.
+    """
+    float64 = numba.types.float64
+    callback = numba.types.FunctionType(float64(float64))
+    signature = numba.types.Tuple((float64, float64[::1], float64[::1]))(
+        callback, float64, float64, float64)
+    return numba.njit(signature, cache=True)(_adaptive_simpson_core)
+
+
+def _riemann_mid_numba(a, b, n, f_jit):
+    """Midpoint rule with evaluation and reduction fused in one parallel loop."""
+    h = (b - a) / n
+    s = 0.0
+    for i in numba.prange(n):
+        s += f_jit(a + (i + 0.5) * h)
+    return s * h
+
+
+# Below this size the NumPy midpoint sum is already fast, and the parallel
+# kernel's thread start-up outweighs the fused loop
+_RIEMANN_MID_NUMBA_MIN_N = 10**6
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_riemann_mid():
+    """
+    _riemann_mid_numba compiled on first use against the same fixed
+    float64(float64) callback type as the adaptive Simpson kernel.
+    """
+    float64 = numba.types.float64
+    callback = numba.types.FunctionType(float64(float64))
+    signature = float64(float64, float64, numba.types.int64, callback)
+    return numba.njit(signature, parallel=True, fastmath=True, cache=True)(_riemann_mid_numba)
+
+
+@functools.lru_cache(maxsize=64)
+def _trapezoid_weights(n):
+    """Trapezoid weights on n + 1 nodes, in units of h."""
+    w = np.ones(n + 1)
+    w[0] = w[-1] = 0.5
+    w.flags.writeable = False
+    return w
+
+
+@functools.lru_cache(maxsize=64)
+def _simpson_weights(n):
+    """Simpson weights (1, 4, 2, ..., 2, 4, 1) on n + 1 nodes, in units of h / 3."""
+    w = np.full(n + 1, 2.0)
+    w[1::2] = 4.0
+    w[0] = w[-1] = 1.0
+    w.flags.writeable = False
+    return w
+
+
+_TILE_SIZE = 65536
+# Simpson interior weights; tiles always start on an odd node index
+_SIMPSON_TILE_WEIGHTS = np.tile([4.0, 2.0], _TILE_SIZE // 2)
+
+
+def _quadrature_sum(f, a, b, n, rule):
+    """
+    Composite rule on n intervals of [a, b], evaluated in fixed-size tiles
+    so the full node and value arrays are never materialized.
+    rule is one of 'left', 'right', 'mid', 'trapezoid' or 'simpson'.
+    """
+    h = (b - a) / n
+    offset = 0.0
+    if rule == 'left':
+        start, stop = 0, n
+    elif rule == 'right':
+        start, stop = 1, n + 1
+    elif rule == 'mid':
+        start, stop, offset = 0, n, 0.5
+    else:
+        # Trapezoid and Simpson: endpoints are handled outside the tile loop
+        start, stop = 1, n
+
+    total = 0.0
+    for lo in range(start, stop, _TILE_SIZE):
+        i = np.arange(lo, min(lo + _TILE_SIZE, stop), dtype=np.float64)
+        y_tile = f(a + (i + offset) * h)
+        if rule == 'simpson':
+            total += _SIMPSON_TILE_WEIGHTS[:len(y_tile)] @ y_tile
+        else:
+            total += np.sum(y_tile)
+
+    if rule == 'trapezoid':
+        return h * (total + (f(a) + f(b)) / 2)
+    if rule == 'simpson':
+        return (h / 3) * (total + f(a) + f(b))
+    return total * h
+
+
+@functools.lru_cache(maxsize=128)
+def _true_area(f_int, a, b):
+    """
+    Cached f_int(b) - f_int(a). Keyed on the callable itself rather than its
+    id(), so the cache holds a reference and ids cannot be recycled.
+    """
+    return float(f_int(b) - f_int(a))
+
+
+_POLY_STR = re.compile(r'^[-+*/0-9x.^()]+$')
+# Higher powers go through sympy rather than dense coefficient arrays
+_POLY_MAX_DEGREE = 100
+_POLY_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+
+
+def _eval_poly_node(node):
+    """
+    Evaluates an expression AST restricted to numbers, x and + - * / **,
+    with x bound to the identity Polynomial. Raises ValueError for anything
+    that is not a polynomial in x.
+    """
+    if isinstance(node, ast.Expression):
+        return _eval_poly_node(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.Name) and node.id == 'x':
+        return Polynomial([0.0, 1.0])
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _eval_poly_node(node.operand)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp) and type(node.op) in _POLY_BINOPS:
+        left = _eval_poly_node(node.left)
+        right = _eval_poly_node(node.right)
+        if isinstance(right, Polynomial) and isinstance(node.op, (ast.Div, ast.Pow)):
+            raise ValueError("not a polynomial")
+        if isinstance(left, Polynomial) and isinstance(node.op, ast.Pow) \
+                and not (type(right) is int and 0 <= right <= _POLY_MAX_DEGREE):
+            raise ValueError("not a polynomial")
+        return _POLY_BINOPS[type(node.op)](left, right)
+    raise ValueError("not a polynomial")
+
+
+def _parse_polynomial(func_str):
+    """Returns func_str as a Polynomial, or None if it is not a plain polynomial in x."""
+    if not _POLY_STR.match(func_str):
+        return None
+    try:
+        poly = _eval_poly_node(ast.parse(func_str.replace('^', '**'), mode='eval'))
+    except (SyntaxError, ValueError, ZeroDivisionError, OverflowError):
+        return None
+    return poly if isinstance(poly, Polynomial) else Polynomial([float(poly)])
+
+
+def _compile_polynomial(func_str):
+    """
+    Compiles a polynomial string already accepted by _parse_polynomial into
+    a function of x. It evaluates the expression as written: expanding
+    (x - 3)**40 into monomial coefficients loses everything to cancellation.
+    """
+    return eval(compile('lambda x: ' + func_str.replace('^', '**'), '<integrand>', 'eval'), {})
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_function(func_str, x_sym):
+    """Cached body of NumericalIntegrator.parse_function for a normalized string."""
+    poly = _parse_polynomial(func_str)
+    if poly is not None:
+        # The coefficients are only used for the antiderivative; constants
+        # stay Polynomials so that f(x) returns an array like x
+        f = _compile_polynomial(func_str) if 'x' in func_str else poly
+        # Scalar version for the compiled kernels, compiled lazily by _scalar_jit
+        f.make_scalar = functools.partial(_compile_polynomial, func_str)
+        # Exact symbolic forms; Poly.integrate is much cheaper than sympy.integrate
+        expr = sympy.sympify(func_str)
+        expr_int = sympy.Poly(expr, x_sym).integrate().as_expr()
+        return f, expr, poly.integ(), expr_int
+
+    # General expressions go through sympy
+    expr = sympy.sympify(func_str)
+    f_lambdified = sympy.lambdify(x_sym, expr, 'numpy')
+    # Scalar version for the compiled kernels, compiled lazily by _scalar_jit
+    f_lambdified.make_scalar = functools.partial(sympy.lambdify, x_sym, expr, 'math')
+    
+    # Analytical integral
+    expr_int = sympy.integrate(expr, x_sym)
+    if expr_int.free_symbols <= {x_sym} and expr_int.is_polynomial(x_sym):
+        # Horner evaluation of the coefficients avoids the lambdify call overhead
+        coeffs = np.array(sympy.Poly(expr_int, x_sym).all_coeffs(), dtype=np.float64)
+        f_int_lambdified = functools.partial(np.polyval, coeffs)
+    else:
+        f_int_lambdified = sympy.lambdify(x_sym, expr_int, 'numpy')
+    
+    return f_lambdified, expr, f_int_lambdified, expr_int
+    
+
+def _evaluate(f, x, dtype=np.float64):
+    """f(x) as an array of dtype; parsed integrands with float64 coefficients upcast FP32 x."""
+    return np.asarray(f(x)).astype(dtype, copy=False)
+
+
+def _midpoints(a, b, n, dtype=np.float64):
+    """Midpoints of the n equal subintervals of [a, b]."""
+    return a + (np.arange(n, dtype=dtype) + 0.5) * ((b - a) / n)
+
+
+class QuadResult:
+    """
+    Result of a quadrature rule. Unpacks like a (total, x, y) tuple.
+    x may be given as a zero-argument callable and y left as None, in which
+    case they are only built (y = f(x), in the dtype of x) on first access.
+    """
+    _fields = ('total', 'x', 'y')
+
+    def __init__(self, total, x, y=None, f=None):
+        self.total = total
+        self._x = x
+        self._y = y
+        self._f = f
+
+    @functools.cached_property
+    def x(self):
+        return self._x() if callable(self._x) else self._x
+
+    @functools.cached_property
+    def y(self):
+        if self._y is None and self._f is not None:
+            return _evaluate(self._f, self.x, self.x.dtype)
+        return self._y
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(getattr(self, name) for name in self._fields[index])
+        return getattr(self, self._fields[index])
+
+
+class RiemannResult(QuadResult):
+    """
+    Result of a Riemann sum. Unpacks like a (total, grid, x, y) tuple, where
+    grid is the full n + 1 point grid (None unless requested).
+    """
+    _fields = ('total', 'grid', 'x', 'y')
+
+    def __init__(self, total, grid, x, y=None, f=None):
+        super().__init__(total, x, y, f)
+        self.grid = grid
+
 
 class NumericalIntegrator:
     """
@@ -13,87 +440,130 @@ class NumericalIntegrator:
         """
         Parses a sympy-style function string into a callable function and its integral.
         Example: 'x**2'
+        Results are cached by the whitespace-normalized string, and plain
+        polynomials skip sympy's lambdify and integrate.
         """
         try:
             # Handle potential 'f(x) =' prefix
             if '=' in func_str:
-                func_str = func_str.split('=', 1)[1].strip()
-            
-            expr = sympy.sympify(func_str)
-            f_lambdified = sympy.lambdify(self.x_sym, expr, 'numpy')
-            
-            # Analytical integral
-            expr_int = sympy.integrate(expr, self.x_sym)
-            f_int_lambdified = sympy.lambdify(self.x_sym, expr_int, 'numpy')
+                func_str = func_str.split('=', 1)[1]
             
-            return f_lambdified, expr, f_int_lambdified, expr_int
+            return _parse_function(''.join(func_str.split()), self.x_sym)
         except Exception as e:
             raise ValueError(f"Error parsing function: {e}")
 
-    def riemann_left(self, f, a, b, n):
-        if n <= 0: return 0, None, None, None
-        x = np.linspace(a, b, num=n+1)
-        x_left = x[:-1]
-        y_left = f(x_left)
-        total = np.sum(y_left) * (b - a) / n
-        return total, x, x_left, y_left
-
-    def riemann_right(self, f, a, b, n):
-        if n <= 0: return 0, None, None, None
-        x = np.linspace(a, b, num=n+1)
-        x_right = x[1:]
-        y_right = f(x_right)
-        total = np.sum(y_right) * (b - a) / n
-        return total, x, x_right, y_right
-
-    def riemann_mid(self, f, a, b, n):
-        if n <= 0: return 0, None, None, None
-        x = np.linspace(a, b, num=n+1)
-        x_mid = (x[:-1] + x[1:]) / 2
-        y_mid = f(x_mid)
-        total = np.sum(y_mid) * (b - a) / n
-        return total, x, x_mid, y_mid
-
-    def trapezoid(self, f, a, b, n):
-        if n <= 0: return 0, None, None
-        x = np.linspace(a, b, num=n+1)
-        y = f(x)
+    def riemann_left(self, f, a, b, n, return_arrays=True, return_full_grid=False, dtype=np.float64):
+        if n <= 0: return RiemannResult(0, None, None)
+        x = np.linspace(a, b, num=n+1, dtype=dtype) if return_full_grid else None
+        x_left = functools.partial(np.linspace, a, b, num=n, endpoint=False, dtype=dtype)
+        if not return_arrays:
+            return RiemannResult(_quadrature_sum(f, a, b, n, 'left'), x, x_left, f=f)
+        x_left = x_left()
+        y_left = _evaluate(f, x_left, dtype)
+        total = np.sum(y_left, dtype=np.float64) * (b - a) / n
+        return RiemannResult(total, x, x_left, y_left)
+
+    def riemann_right(self, f, a, b, n, return_arrays=True, return_full_grid=False, dtype=np.float64):
+        if n <= 0: return RiemannResult(0, None, None)
+        x = np.linspace(a, b, num=n+1, dtype=dtype) if return_full_grid else None
+        x_right = functools.partial(np.linspace, a + (b - a) / n, b, num=n, dtype=dtype)
+        if not return_arrays:
+            return RiemannResult(_quadrature_sum(f, a, b, n, 'right'), x, x_right, f=f)
+        x_right = x_right()
+        y_right = _evaluate(f, x_right, dtype)
+        total = np.sum(y_right, dtype=np.float64) * (b - a) / n
+        return RiemannResult(total, x, x_right, y_right)
+
+    def riemann_mid(self, f, a, b, n, return_arrays=True, return_full_grid=False, dtype=np.float64):
+        if n <= 0: return RiemannResult(0, None, None)
+        x = np.linspace(a, b, num=n+1, dtype=dtype) if return_full_grid else None
+        x_mid = functools.partial(_midpoints, a, b, n, dtype)
+        if not return_arrays:
+            f_jit = _scalar_jit(f) if n >= _RIEMANN_MID_NUMBA_MIN_N else None
+            if f_jit is not None:
+                total = _compiled_riemann_mid()(float(a), float(b), n, f_jit)
+            else:
+                total = _quadrature_sum(f, a, b, n, 'mid')
+            return RiemannResult(total, x, x_mid, f=f)
+        x_mid = x_mid()
+        y_mid = _evaluate(f, x_mid, dtype)
+        total = np.sum(y_mid, dtype=np.float64) * (b - a) / n
+        return RiemannResult(total, x, x_mid, y_mid)
+
+    def trapezoid(self, f, a, b, n, return_arrays=True, dtype=np.float64):
+        if n <= 0: return QuadResult(0, None)
+        x = functools.partial(np.linspace, a, b, num=n+1, dtype=dtype)
+        if not return_arrays:
+            return QuadResult(_quadrature_sum(f, a, b, n, 'trapezoid'), x, f=f)
+        x = x()
+        y = _evaluate(f, x, dtype)
         h = (b - a) / n
-        total = (h / 2) * (y[0] + 2 * np.sum(y[1:-1]) + y[-1])
-        return total, x, y
+        total = h * (_trapezoid_weights(n) @ y)
+        return QuadResult(total, x, y)
 
-    def simpson(self, f, a, b, n):
-        if n <= 0: return 0, None, None
+    def simpson(self, f, a, b, n, return_arrays=True, dtype=np.float64):
+        if n <= 0: return QuadResult(0, None)
         if n % 2 != 0:
             n += 1 # Ensure n is even for Simpson's
+        x = functools.partial(np.linspace, a, b, num=n+1, dtype=dtype)
+        if not return_arrays:
+            return QuadResult(_quadrature_sum(f, a, b, n, 'simpson'), x, f=f)
             
-        x = np.linspace(a, b, num=n+1)
-        y = f(x)
+        x = x()
+        y = _evaluate(f, x, dtype)
         h = (b - a) / n
         
-        total = (h / 3) * (y[0] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-2:2]) + y[-1])
-        return total, x, y
+        total = (h / 3) * (_simpson_weights(n) @ y)
+        return QuadResult(total, x, y)
 
     def adaptive_simpson(self, f, a, b, tol):
         """
         Recursive Adaptive Simpson's Rule.
         Returns the approximate integral and the list of evaluation points used.
+        If f is a numba-jitted function or cfunc, or a parsed integrand that
+        numba can compile, the compiled iterative kernel is used; otherwise
+        the C extension runs the same algorithm if it has been built.
         """
-        eval_points = []
+        f_jit = _scalar_jit(f)
+        if f_jit is not None:
+            kernel = _compiled_adaptive_simpson_core()
+            result, xs, ys = kernel(f_jit, float(a), float(b), float(tol))
+            order = np.argsort(xs)
+            return QuadResult(result, xs[order], ys[order])
+        if adaptive_simpson_c is not None:
+            try:
+                result, xs, ys = adaptive_simpson_c(f, float(a), float(b), float(tol))
+            except ZeroDivisionError as e:
+                # Python floats raise where NumPy and the compiled kernel give inf
+                raise ValueError("integrand is not finite on the integration interval") from e
+            order = np.argsort(xs)
+            return QuadResult(result, xs[order], ys[order])
+
+        eval_points = {}
+
+        def eval_f(x):
+            # Memoized: shared endpoints between neighbouring intervals are evaluated once
+            if x not in eval_points:
+                try:
+                    eval_points[x] = f(x)
+                except ZeroDivisionError as e:
+                    raise ValueError("integrand is not finite on the integration interval") from e
+            return eval_points[x]
         
         def simpson_step(f, a, b):
             c = (a + b) / 2
             h = b - a
-            fa = f(a)
-            fb = f(b)
-            fc = f(c)
-            eval_points.extend([a, b, c])
+            fa = eval_f(a)
+            fb = eval_f(b)
+            fc = eval_f(c)
             return (h / 6) * (fa + 4 * fc + fb)
 
         def recursive_step(f, a, b, tol, whole):
             c = (a + b) / 2
             left = simpson_step(f, a, c)
             right = simpson_step(f, c, b)
+            if not np.isfinite(left + right - whole):
+                raise ValueError("integrand is not finite on the integration interval")
             if abs(left + right - whole) <= 15 * tol:
                 return left + right + (left + right - whole) / 15
             return recursive_step(f, a, c, tol / 2, left) + \
@@ -102,10 +572,15 @@ class NumericalIntegrator:
         whole = simpson_step(f, a, b)
         result = recursive_step(f, a, b, tol, whole)
         
-        unique_points = np.sort(np.unique(eval_points))
-        return result, unique_points, f(unique_points)
+        # Points are already unique as dict keys; sort them in C rather than in Python
+        xs = np.fromiter(eval_points.keys(), dtype=np.float64, count=len(eval_points))
+        ys = np.fromiter(eval_points.values(), dtype=np.float64, count=len(eval_points))
+        order = np.argsort(xs)
+        return QuadResult(result, xs[order], ys[order])
 
     def get_true_area(self, f_int, a, b):
+        if isinstance(f_int, Hashable):
+            return _true_area(f_int, a, b)
         return float(f_int(b) - f_int(a))
 
     def get_error_metrics(self, approx_area, true_area):
@@ -113,24 +588,86 @@ class NumericalIntegrator:
         rel_error = (abs_error / abs(true_area)) * 100 if true_area != 0 else 0
         return abs_error, rel_error
 
+    def _shared_grid_totals(self, f, a, b, ns, method_name):
+        """
+        Approximations for every n in ns from a single evaluation of f on the
+        finest grid, subsampled with a stride for the coarser ones.
+        Returns None when the nodes are not shared, i.e. for midpoint rules or
+        when some n does not divide max(ns).
+        """
+        if method_name not in ('Riemann Left', 'Riemann Right', 'Trapezoidal', 'Simpson'):
+            return None
+        if method_name == 'Simpson':
+            ns = [n + n % 2 for n in ns]
+        if len(ns) == 0 or min(ns) <= 0:
+            return None
+        n_max = max(ns)
+        if any(n_max % n for n in ns):
+            return None
+        
+        y_fine = f(np.linspace(a, b, num=n_max+1))
+        totals = []
+        for n in ns:
+            y = y_fine[::n_max // n]
+            h = (b - a) / n
+            if method_name == 'Riemann Left':
+                totals.append(np.sum(y[:-1]) * h)
+            elif method_name == 'Riemann Right':
+                totals.append(np.sum(y[1:]) * h)
+            elif method_name == 'Trapezoidal':
+                totals.append(h * (_trapezoid_weights(n) @ y))
+            else:
+                totals.append((h / 3) * (_simpson_weights(n) @ y))
+        return totals
+
+    def _batched_gauss_totals(self, f, a, b, ns):
+        """
+        Gaussian quadrature for every n in ns with a single call to f on the
+        concatenated node sets, then a dot product per n on its slice.
+        """
+        node_sets = [_gauss_nodes(n, a, b) for n in ns if n > 0]
+        if not node_sets:
+            return [0] * len(ns)
+        all_y = f(np.concatenate([nodes for nodes, _ in node_sets]))
+        
+        totals = []
+        offset = 0
+        for n in ns:
+            if n <= 0:
+                totals.append(0)
+                continue
+            _, weights = _gauss_nodes(n, a, b)
+            totals.append(weights @ all_y[offset:offset + n])
+            offset += n
+        return totals
+
     def get_convergence_data(self, f, a, b, f_int, ns, method_name):
         true_area = self.get_true_area(f_int, a, b)
         errors = []
         
+        # Only the totals are needed; the lazy x/y arrays are never built
         method_map = {
-            'Riemann Left': self.riemann_left,
-            'Riemann Right': self.riemann_right,
-            'Riemann Mid': self.riemann_mid,
-            'Trapezoidal': self.trapezoid,
-            'Simpson': self.simpson
+            'Riemann Left': functools.partial(self.riemann_left, return_arrays=False),
+            'Riemann Right': functools.partial(self.riemann_right, return_arrays=False),
+            'Riemann Mid': functools.partial(self.riemann_mid, return_arrays=False),
+            'Trapezoidal': functools.partial(self.trapezoid, return_arrays=False),
+            'Simpson': functools.partial(self.simpson, return_arrays=False),
+            'Gaussian Quadrature': self.gaussian_quadrature,
+            'Clenshaw-Curtis': self.clenshaw_curtis
         }
         
         calc_method = method_map.get(method_name)
         if not calc_method:
             return [], []
             
-        for n in ns:
-            approx, *_ = calc_method(f, a, b, n)
+        if method_name == 'Gaussian Quadrature':
+            totals = self._batched_gauss_totals(f, a, b, ns)
+        else:
+            totals = self._shared_grid_totals(f, a, b, ns, method_name)
+        if totals is None:
+            totals = [calc_method(f, a, b, n).total for n in ns]
+            
+        for approx in totals:
             abs_err, _ = self.get_error_metrics(approx, true_area)
             errors.append(max(abs_err, 1e-18))
             
@@ -140,14 +677,33 @@ class NumericalIntegrator:
         """
         N-point Gaussian Quadrature. 
         """
-        if n <= 0: return 0, None, None
+        if n <= 0: return QuadResult(0, None)
+        
+        # Nodes and weights on [a, b] are cached per (n, a, b)
+        transformed_nodes, transformed_weights = _gauss_nodes(n, a, b)
+        
+        y = f(transformed_nodes)
+        total = transformed_weights @ y
+        return QuadResult(total, transformed_nodes, y)
+
+    def clenshaw_curtis(self, f, a, b, n):
+        """
+        Clenshaw-Curtis quadrature on n + 1 Chebyshev points.
+        The Chebyshev coefficients come from a DCT-I, computed as a real FFT
+        of the even extension of the samples, so the cost is O(n log n).
+        """
+        if n <= 0: return QuadResult(0, None)
         
-        # Use numpy's leggauss for weights and nodes on [-1, 1]
-        nodes, weights = np.polynomial.legendre.leggauss(n)
+        theta = np.pi * np.arange(n + 1) / n
+        nodes = 0.5 * (b - a) * np.cos(theta) + 0.5 * (b + a)
+        y = f(nodes)
         
-        # Transform nodes and weights to [a, b]
-        transformed_nodes = 0.5 * (nodes + 1) * (b - a) + a
-        transformed_weights = 0.5 * weights * (b - a)
+        # DCT-I: coefficients of the Chebyshev interpolant, end terms halved
+        coeffs = np.fft.rfft(np.concatenate([y, y[-2:0:-1]])).real / n
+        coeffs[0] /= 2
+        coeffs[n] /= 2
         
-        total = np.sum(transformed_weights * f(transformed_nodes))
-        return total, transformed_nodes, f(transformed_nodes)
+        # Only even T_k contribute: integral of T_k over [-1, 1] is 2 / (1 - k^2)
+        k = np.arange(0, n + 1, 2)
+        total = 0.5 * (b - a) * ((2 / (1 - k**2)) @ coeffs[::2])
+        return QuadResult(total, nodes[::-1], y[::-1])
@@ -0,0 +1,17 @@
+"""
+Builds the optional C extension for adaptive Simpson's rule:
+
+    python setup.py build_ext --inplace
+
+integrator.py falls back to pure Python when the extension is not built.
+"""
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    name="numintviz-adaptive",
+    ext_modules=cythonize(
+        [Extension("_adaptive", ["_adaptive.pyx"])],
+        language_level=3,
+    ),
+)
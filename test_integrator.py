@@ -1,10 +1,15 @@
 import unittest
+from unittest import mock
+
 import numpy as np
-from integrator import NumericalIntegrator
+import integrator
+from integrator import NumericalIntegrator, adaptive_simpson_c, numba
 
 class TestNumericalIntegrator(unittest.TestCase):
     def setUp(self):
         self.integrator = NumericalIntegrator()
+        # Parsed functions and their lazily compiled f.jit are cached per module
+        integrator._parse_function.cache_clear()
 
     def test_riemann_left(self):
         # f(x) = x, area from 0 to 1 should be approx 0.5 with high n
@@ -24,6 +29,65 @@ class TestNumericalIntegrator(unittest.TestCase):
         approx, *_ = self.integrator.simpson(f, 0, 2, 10)
         self.assertAlmostEqual(approx, 4.0, places=7)
 
+    def test_tiled_sum_matches_arrays(self):
+        # The tiled path must agree with the full-array path across tile boundaries
+        f = lambda x: np.sin(x) + x**2
+        methods = ['riemann_left', 'riemann_right', 'riemann_mid', 'trapezoid', 'simpson']
+        for name in methods:
+            method = getattr(self.integrator, name)
+            for n in [1, 7, 65536, 70001]:
+                expected, *_ = method(f, 0.3, 2.7, n)
+                approx, *_ = method(f, 0.3, 2.7, n, return_arrays=False)
+                self.assertAlmostEqual(approx, expected, places=10, msg=f"{name}, n={n}")
+
+    def test_convergence_shared_grid(self):
+        # Powers of two share the finest grid; results must match per-n calls
+        f = lambda x: np.exp(x)
+        f_int = lambda x: np.exp(x)
+        ns = [2, 4, 8, 16, 64]
+        for name, method in [('Trapezoidal', self.integrator.trapezoid),
+                             ('Simpson', self.integrator.simpson)]:
+            res_n, errors = self.integrator.get_convergence_data(f, 0, 1, f_int, ns, name)
+            self.assertEqual(res_n, ns)
+            for n, err in zip(ns, errors):
+                approx, *_ = method(f, 0, 1, n)
+                self.assertAlmostEqual(err, max(abs(approx - (np.e - 1)), 1e-18), places=12)
+
+    def test_lazy_plot_arrays(self):
+        # Without return_arrays, x and y are only built when accessed
+        calls = []
+        def f(x):
+            calls.append(len(np.atleast_1d(x)))
+            return x**2
+        result = self.integrator.trapezoid(f, 0, 3, 10, return_arrays=False)
+        n_calls = len(calls)
+        self.assertAlmostEqual(result.total, 9.045, places=10)
+        self.assertEqual(len(calls), n_calls)
+        approx, x, y = result
+        self.assertEqual(len(calls), n_calls + 1)
+        np.testing.assert_allclose(x, np.linspace(0, 3, 11))
+        np.testing.assert_allclose(y, x**2)
+
+        total, grid, x_mid, y_mid = self.integrator.riemann_mid(np.sin, 0, 1, 4, return_arrays=False)
+        self.assertIsNone(grid)
+        np.testing.assert_allclose(x_mid, [0.125, 0.375, 0.625, 0.875])
+        np.testing.assert_allclose(y_mid, np.sin(x_mid))
+
+    def test_float32_plot_arrays(self):
+        # FP32 plot arrays, FP64 accumulation of the total
+        f = lambda x: np.sin(x)
+        for method in [self.integrator.riemann_mid, self.integrator.trapezoid,
+                       self.integrator.simpson]:
+            approx, *arrays = method(f, 0, np.pi, 1000, dtype=np.float32)
+            self.assertEqual(arrays[-1].dtype, np.float32)
+            self.assertIsInstance(approx, (float, np.float64))
+            self.assertAlmostEqual(approx, 2.0, places=5)
+        # Parsed polynomials have float64 coefficients but still honour dtype
+        poly, *_ = self.integrator.parse_function("x^2")
+        for return_arrays in (True, False):
+            result = self.integrator.trapezoid(poly, 0, 1, 10, return_arrays, dtype=np.float32)
+            self.assertEqual(result.y.dtype, np.float32)
+
     def test_gaussian_quadrature(self):
         # Exact for polynomials up to degree 2n-1
         f = lambda x: x**5
@@ -31,10 +95,146 @@ class TestNumericalIntegrator(unittest.TestCase):
         approx, *_ = self.integrator.gaussian_quadrature(f, 0, 1, 3)
         self.assertAlmostEqual(approx, 1/6, places=7)
 
+    def test_gaussian_quadrature_single_evaluation(self):
+        # f must be evaluated once; the returned values are the ones used for the total
+        calls = []
+        def f(x):
+            calls.append(x)
+            return x**2
+        approx, x, y = self.integrator.gaussian_quadrature(f, 0, 3, 4)
+        self.assertEqual(len(calls), 1)
+        np.testing.assert_allclose(y, x**2)
+        self.assertAlmostEqual(approx, 9.0, places=10)
+
+    def test_adaptive_simpson(self):
+        # f(x) = sin(x), area from 0 to pi should be 2
+        f = lambda x: np.sin(x)
+        approx, x, y = self.integrator.adaptive_simpson(f, 0, np.pi, 1e-8)
+        self.assertAlmostEqual(approx, 2.0, places=7)
+        self.assertTrue(np.all(np.diff(x) > 0))
+        np.testing.assert_allclose(y, np.sin(x))
+
+    def test_adaptive_simpson_python(self):
+        # Force the memoized Python recursion even when the C extension is built
+        calls = []
+        def f(x):
+            calls.append(x)
+            return np.sin(x)
+        with mock.patch.object(integrator, 'adaptive_simpson_c', None):
+            approx, x, y = self.integrator.adaptive_simpson(f, 0, np.pi, 1e-8)
+        self.assertAlmostEqual(approx, 2.0, places=7)
+        # Every point is evaluated exactly once
+        self.assertEqual(len(calls), len(set(calls)))
+        self.assertEqual(len(calls), len(x))
+        self.assertTrue(np.all(np.diff(x) > 0))
+        np.testing.assert_allclose(y, np.sin(x))
+
+    def test_adaptive_simpson_non_finite(self):
+        # sqrt of negative x is NaN: must raise instead of refining forever
+        f = lambda x: np.sqrt(x)
+        with np.errstate(invalid='ignore'):
+            with self.assertRaises(ValueError):
+                self.integrator.adaptive_simpson(f, -1.0, 1.0, 1e-6)
+        # Parsed integrands take the jitted path when numba is installed
+        for func_str in ["1/x", "1/(x - 0.5)", "1/sqrt(x)"]:
+            f, *_ = self.integrator.parse_function(func_str)
+            with np.errstate(divide='ignore'):
+                with self.assertRaises(ValueError):
+                    self.integrator.adaptive_simpson(f, 0.0, 1.0, 1e-6)
+
+    @unittest.skipIf(numba is None, "numba not installed")
+    def test_adaptive_simpson_jitted_non_finite(self):
+        f_jit = numba.njit(lambda x: np.sqrt(x))
+        with self.assertRaises(ValueError):
+            self.integrator.adaptive_simpson(f_jit, -1.0, 1.0, 1e-6)
+
+    @unittest.skipIf(numba is None, "numba not installed")
+    def test_adaptive_simpson_max_depth(self):
+        # A jump is never resolved to tolerance; refinement stops at the depth limit
+        f_jit = numba.njit(lambda x: 1.0 if x > 1 / 3 else 0.0)
+        approx, x, _ = self.integrator.adaptive_simpson(f_jit, 0.0, 1.0, 1e-30)
+        self.assertAlmostEqual(approx, 2 / 3, places=10)
+        self.assertLess(len(x), 1000)
+
+    @unittest.skipIf(numba is None, "numba not installed")
+    def test_adaptive_simpson_jitted(self):
+        f_jit = numba.njit(lambda x: np.sin(x))
+        approx, x, y = self.integrator.adaptive_simpson(f_jit, 0, np.pi, 1e-8)
+        expected, x_py, _ = self.integrator.adaptive_simpson(lambda x: np.sin(x), 0, np.pi, 1e-8)
+        self.assertAlmostEqual(approx, expected, places=12)
+        np.testing.assert_allclose(x, x_py)
+        np.testing.assert_allclose(y, np.sin(x))
+
+    def test_convergence_gaussian_batched(self):
+        # One batched evaluation must match per-n Gaussian quadrature
+        f = lambda x: np.exp(x)
+        f_int = lambda x: np.exp(x)
+        ns = [1, 2, 3, 5, 8]
+        _, errors = self.integrator.get_convergence_data(f, 0, 1, f_int, ns, 'Gaussian Quadrature')
+        for n, err in zip(ns, errors):
+            approx, *_ = self.integrator.gaussian_quadrature(f, 0, 1, n)
+            self.assertAlmostEqual(err, max(abs(approx - (np.e - 1)), 1e-18), places=12)
+
+    def test_clenshaw_curtis(self):
+        # n + 1 Chebyshev points integrate polynomials of degree n exactly
+        approx, x, y = self.integrator.clenshaw_curtis(lambda x: x**4, 0, 2, 4)
+        self.assertAlmostEqual(approx, 6.4, places=12)
+        self.assertTrue(np.all(np.diff(x) > 0))
+        # Spectral convergence for smooth integrands
+        approx, *_ = self.integrator.clenshaw_curtis(np.exp, 0, 1, 16)
+        self.assertAlmostEqual(approx, np.e - 1, places=12)
+
+    @unittest.skipIf(adaptive_simpson_c is None, "C extension not built")
+    def test_adaptive_simpson_c(self):
+        approx, x, y = adaptive_simpson_c(np.sin, 0.0, np.pi, 1e-8)
+        self.assertAlmostEqual(approx, 2.0, places=7)
+        self.assertEqual(len(np.unique(x)), len(x))
+        np.testing.assert_allclose(y, np.sin(x))
+
     def test_parse_function(self):
         f, expr, f_int, expr_int = self.integrator.parse_function("x**2")
         self.assertEqual(float(f(2)), 4.0)
         self.assertAlmostEqual(self.integrator.get_true_area(f_int, 0, 3), 9.0)
 
+    def test_parse_function_polynomial(self):
+        # Plain polynomials bypass lambdify; results are cached by normalized string
+        parsed = self.integrator.parse_function("f(x) = 3*x^2 - (x + 1)/2")
+        f, expr, f_int, expr_int = parsed
+        x = self.integrator.x_sym
+        self.assertEqual(expr, 3*x**2 - (x + 1) / 2)
+        self.assertEqual(expr_int, x**3 - x**2 / 4 - x / 2)
+        self.assertAlmostEqual(float(f(2)), 10.5)
+        self.assertAlmostEqual(self.integrator.get_true_area(f_int, 0, 2), 6.0)
+        self.assertIs(self.integrator.parse_function("3*x^2-(x+1)/2"), parsed)
+        # Evaluated as written, not from the cancelling expanded coefficients
+        f, *_ = self.integrator.parse_function("(x-3)**40")
+        self.assertEqual(float(f(3.0)), 0.0)
+        f, *_ = self.integrator.parse_function("(x-2)^30")
+        approx, *_ = self.integrator.simpson(f, 1, 3, 1000)
+        self.assertAlmostEqual(approx, 2 / 31, places=6)
+
+    @unittest.skipIf(numba is None, "numba not installed")
+    def test_parse_function_jit(self):
+        f, *_ = self.integrator.parse_function("sin(x) + 2")
+        # Compiled lazily, on first use by a compiled kernel
+        self.assertFalse(hasattr(f, 'jit'))
+        approx, *_ = self.integrator.adaptive_simpson(f, 0, np.pi, 1e-8)
+        self.assertAlmostEqual(approx, 2 * np.pi + 2, places=7)
+        self.assertIsNotNone(f.jit)
+        self.assertAlmostEqual(f.jit(1.0), float(f(1.0)))
+        n = integrator._RIEMANN_MID_NUMBA_MIN_N
+        fused, *_ = self.integrator.riemann_mid(f, 0, np.pi, n, return_arrays=False)
+        expected, *_ = self.integrator.riemann_mid(f, 0, np.pi, n)
+        self.assertAlmostEqual(fused, expected, places=10)
+
+    @unittest.skipIf(numba is None, "numba not installed")
+    def test_parse_function_jit_constant(self):
+        # Constant expressions lambdify to an int-returning function
+        for func_str in ["sin(0) + 1", "(x + 1)/(x + 1)"]:
+            f, *_ = self.integrator.parse_function(func_str)
+            approx, *_ = self.integrator.adaptive_simpson(f, 0, 1, 1e-6)
+            self.assertAlmostEqual(approx, 1.0)
+            self.assertIsNotNone(f.jit)
+
 if __name__ == "__main__":
     unittest.main()